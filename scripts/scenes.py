@@ -1,61 +1,121 @@
+import functools
+import os
+
+import numpy as np
 from manim import *
 
+# Labels are short, so ligature resolution adds shaping work with no visual benefit.
+Text.set_default(disable_ligatures=True)
+
+# Set MANIM_DEV_FAST=1 to shrink every pause while iterating on the animations.
+DEV_FAST = os.environ.get("MANIM_DEV_FAST") == "1"
+
+# Basis tiles are colored by basis: blue for Z, red for X.
+BASIS_COLORS = {'Z': BLUE, 'X': RED}
+
+# The protocol run shown across scenes: Alice's random bits and bases, and Bob's random bases.
+ALICE_BITS = [0, 1, 1, 0, 1, 0, 0, 1]
+ALICE_BASES = ['Z', 'X', 'Z', 'X', 'X', 'Z', 'Z', 'X']
+BOB_BASES = ['Z', 'Z', 'Z', 'X', 'Z', 'Z', 'X', 'X']
+# Positions where Bob measured in Alice's basis; only these bits survive the sift.
+SIFT_MASK = np.array(ALICE_BASES) == np.array(BOB_BASES)
+
+
+def _wait(scene, duration):
+    # Manim cannot render less than one frame, so that is the shortest useful pause.
+    scene.wait(1 / config.frame_rate if DEV_FAST else duration)
+
+
+@functools.lru_cache(maxsize=None)
+def _text(text, color=WHITE, font_size=DEFAULT_FONT_SIZE):
+    # The same few glyphs ('0', '1', 'Z', 'X', verdicts) recur; shape each once and copy it.
+    return Text(text, color=color, font_size=font_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _basis_tile(basis):
+    # Only two distinct tiles exist; build each once and hand out copies.
+    return Rectangle(width=0.6, height=0.9, color=BASIS_COLORS[basis]).add(_text(basis).copy())
+
+
+def _basis_row(bases, buff):
+    return VGroup(*[_basis_tile(b).copy() for b in bases]).arrange(RIGHT, buff=buff)
+
+
+@functools.lru_cache(maxsize=None)
+def _character(name):
+    # Alice, Bob and Moshe reappear across scenes; build each figure once.
+    return Character(name=name)
+
+
+@functools.lru_cache(maxsize=None)
+def _card_back():
+    # Face-down cards all look the same, so a deck is copies of one card.
+    return Card(is_face_up=False)
+
+
 class IntroductionScene(Scene):
     def construct(self):
         # Establish the title and core problem.
         title = Text("BB84: The Protocol as a Card Game", font_size=48)
         self.play(Write(title))
-        self.wait(1)
+        _wait(self, 1)
         self.play(FadeOut(title))
 
         # Introduce the characters.
-        alice = Character(name="Alice").to_edge(LEFT, buff=1.5)
-        bob = Character(name="Bob").to_edge(RIGHT, buff=1.5)
+        alice = _character("Alice").copy().to_edge(LEFT, buff=1.5)
+        bob = _character("Bob").copy().to_edge(RIGHT, buff=1.5)
         self.play(FadeIn(alice, shift=LEFT), FadeIn(bob, shift=RIGHT))
-        self.wait(1)
+        _wait(self, 1)
 
         # Frame the problem as a game with specific rules.
         premise_text = Text(
             "A game whose rules are a direct analogy for quantum mechanics.",
             font_size=32
         ).to_edge(UP)
-        self.play(Write(premise_text))
+        self.play(FadeIn(premise_text, shift=0.3*DOWN), run_time=0.8)
         
         # Introduce the main object of the game.
         deck = VGroup(*[
-            Card(is_face_up=False) for _ in range(8)
+            _card_back().copy() for _ in range(8)
         ]).arrange(RIGHT, buff=0.1).move_to(ORIGIN)
-        self.play(AnimationGroup(*[FadeIn(card, shift=DOWN) for card in deck], lag_ratio=0.1))
-        self.wait(2)
+        self.play(LaggedStart(*[FadeIn(card, shift=DOWN) for card in deck], lag_ratio=0.1))
+        _wait(self, 2)
 
         # Clear the scene for the next part.
-        self.play(FadeOut(VGroup(alice, bob, premise_text, deck)))
+        self.remove(alice, bob, premise_text, deck)
+        _wait(self, 0.1)
 
 
 class TheSetupScene(Scene):
     def construct(self):
         # Establish the players in their positions.
-        alice = Character(name="Alice").to_edge(LEFT, buff=1.5)
-        bob = Character(name="Bob").to_edge(RIGHT, buff=1.5)
-        moshe = Character(name="Moshe").to_edge(DOWN, buff=1)
+        alice = _character("Alice").copy().to_edge(LEFT, buff=1.5)
+        bob = _character("Bob").copy().to_edge(RIGHT, buff=1.5)
+        moshe = _character("Moshe").copy().to_edge(DOWN, buff=1)
         self.add(alice, bob, moshe)
+        # The players never move, so query their anchor points once.
+        alice_center, bob_center = alice.get_center(), bob.get_center()
 
         # Visualize the Public Channel.
         public_channel = DashedLine(alice.get_top(), bob.get_top(), color=GREY_A).shift(UP*2)
+        public_center = public_channel.get_center()
         public_label = Text("Public Channel", font_size=24).next_to(public_channel, UP, buff=0.2)
         self.play(Create(public_channel), Write(public_label))
         
         # Demonstrate that the Public Channel is readable by Moshe.
-        open_message = Text("MSG: Hello Bob!", font_size=20).move_to(alice.get_center())
-        moshe_reads_line = DashedLine(moshe.get_top(), public_channel.get_center(), color=YELLOW)
-        self.play(open_message.animate.move_to(public_channel.get_center()))
-        self.play(ShowCreation(moshe_reads_line), run_time=0.5)
-        self.play(FadeOut(moshe_reads_line), run_time=0.5)
-        self.play(open_message.animate.move_to(bob.get_center()), FadeOut(open_message, shift=RIGHT))
-        self.wait(1)
+        open_message = Text("MSG: Hello Bob!", font_size=20).move_to(alice_center)
+        moshe_reads_line = DashedLine(moshe.get_top(), public_center, color=YELLOW)
+        self.play(open_message.animate.move_to(public_center))
+        # A brief static flash is enough to show Moshe peeking at the message.
+        self.add(moshe_reads_line)
+        _wait(self, 0.1)
+        self.remove(moshe_reads_line)
+        self.play(open_message.animate.move_to(bob_center), FadeOut(open_message, shift=RIGHT))
+        _wait(self, 1)
 
         # Visualize the Quantum Channel.
-        quantum_channel = Line(alice.get_center(), bob.get_center(), color=BLUE_C, stroke_width=6)
+        quantum_channel = Line(alice_center, bob_center, color=BLUE_C, stroke_width=6)
         quantum_label = Text("Quantum Channel", font_size=24).next_to(quantum_channel, UP, buff=0.2)
         self.play(
             ReplacementTransform(public_channel, quantum_channel),
@@ -64,76 +124,71 @@ class TheSetupScene(Scene):
 
         # Show that Moshe can only observe, not read without consequence.
         sealed_package = Rectangle(width=1, height=0.6, color=DARK_GREY, fill_opacity=1)
-        messenger = Messenger(item=sealed_package).move_to(alice.get_center())
+        messenger = Messenger(item=sealed_package).move_to(alice_center)
         self.play(FadeIn(messenger))
-        self.play(messenger.travel(quantum_channel))
-        self.wait(2)
+        self.play(MoveAlongPath(messenger, quantum_channel), run_time=2, rate_func=linear)
+        _wait(self, 2)
 
 
-class AlicePreparesAndEncodesScene(Scene):
+class AlicePreparesAndEncodesScene(MovingCameraScene):
     def construct(self):
         # Focus on Alice's workspace.
-        alice = Character(name="Alice").to_edge(LEFT, buff=1.5)
+        alice = _character("Alice").copy().to_edge(LEFT, buff=1.5)
         self.add(alice)
-        self.camera.frame.save_state()
         self.play(self.camera.frame.animate.set(width=9).move_to(alice.get_center() + RIGHT*2.5))
 
-        # Define Alice's random bit and basis sequences.
-        bit_values = [0, 1, 1, 0, 1, 0, 0, 1]
-        basis_choices = ['Z', 'X', 'Z', 'X', 'X', 'Z', 'Z', 'X']
-
-        # Display the sequences visually.
+        # Display Alice's random bit and basis sequences.
         bits_header = Text("Alice's Bits:").to_corner(UL).shift(RIGHT)
-        bit_mobjects = VGroup(*[Integer(b) for b in bit_values]).arrange(RIGHT, buff=0.7).next_to(bits_header, DOWN)
+        bit_mobjects = VGroup(*[_text(str(b)).copy() for b in ALICE_BITS]).arrange(RIGHT, buff=0.7).next_to(bits_header, DOWN)
         
         bases_header = Text("Alice's Bases:").next_to(bit_mobjects, DOWN, buff=0.8, aligned_edge=LEFT)
-        basis_mobjects = VGroup(*[
-            Rectangle(width=0.6, height=0.9, color=(BLUE if b == 'Z' else RED)).add(Text(b))
-            for b in basis_choices
-        ]).arrange(RIGHT, buff=0.5).next_to(bases_header, DOWN)
+        basis_mobjects = _basis_row(ALICE_BASES, buff=0.5).next_to(bases_header, DOWN)
 
         self.play(Write(bits_header))
         self.play(AnimationGroup(*[FadeIn(b) for b in bit_mobjects], lag_ratio=0.1))
-        self.wait(0.5)
+        _wait(self, 0.5)
         self.play(Write(bases_header))
         self.play(AnimationGroup(*[FadeIn(b) for b in basis_mobjects], lag_ratio=0.1))
-        self.wait(1)
-
-        # Visually encode each bit into a card.
-        encoded_cards = VGroup()
-        for i in range(len(bit_values)):
-            # Create a card with the correct value and basis (back color).
-            card = Card(value=bit_values[i], basis=basis_choices[i], is_face_up=True)
-            card.move_to(bit_mobjects[i].get_center() + DOWN * 4)
-            self.add(card)
-            # Flip it face-down to hide the number.
-            self.play(card.flip(), run_time=0.5)
-            encoded_cards.add(card)
+        _wait(self, 1)
+
+        # Visually encode each bit into a card with the correct value and basis (back color).
+        card_positions = np.array([b.get_center() for b in bit_mobjects]) + DOWN * 4
+        encoded_cards = VGroup(*[
+            Card(value=bit, basis=basis, is_face_up=True).move_to(position)
+            for bit, basis, position in zip(ALICE_BITS, ALICE_BASES, card_positions)
+        ])
+        self.add(encoded_cards)
+        # Flip them face-down to hide the numbers, in a single pass.
+        self.play(AnimationGroup(*[card.flip() for card in encoded_cards], lag_ratio=0.1), run_time=2)
 
         # Group the prepared cards and send them.
-        self.play(encoded_cards.animate.arrange(RIGHT, buff=0.1).move_to(ORIGIN + DOWN*2))
-        package = SurroundingRectangle(encoded_cards, buff=0.2, color=DARK_GREY, fill_opacity=0.8)
+        card_buff, row_center = 0.1, ORIGIN + DOWN*2
+        self.play(encoded_cards.animate.arrange(RIGHT, buff=card_buff).move_to(row_center))
+        # The row layout is fixed, so size the package from a single card.
+        card_count = len(encoded_cards)
+        package = Rectangle(
+            width=card_count * encoded_cards[0].width + (card_count - 1) * card_buff + 0.4,
+            height=encoded_cards[0].height + 0.4,
+            color=DARK_GREY, fill_opacity=0.8
+        ).move_to(row_center)
         self.play(Create(package))
         self.play(FadeOut(VGroup(encoded_cards, package), shift=RIGHT))
-        
-        # Reset camera view.
-        self.play(Restore(self.camera.frame))
-        self.wait(1)
+        _wait(self, 1)
 
 
 class MosheInterceptsScene(Scene):
     def construct(self):
         # Moshe intercepts one card from the transmission.
-        moshe = Character(name="Moshe").to_edge(DOWN, buff=1)
+        moshe = _character("Moshe").copy().to_edge(DOWN, buff=1)
         self.add(moshe)
         # Example card: Alice prepared a '0' in the 'Z' (blue) basis.
         intercepted_card = Card(value=0, basis='Z', is_face_up=False).move_to(moshe.get_top() + UP)
         self.play(FadeIn(intercepted_card))
-        self.wait(0.5)
+        _wait(self, 0.5)
 
         # Demonstrate the rule of mismatched basis measurement.
         guess_text = Text("Moshe's Guess: Basis 'X' (Incorrect)", font_size=28).to_edge(UP)
-        self.play(Write(guess_text))
+        self.play(FadeIn(guess_text, shift=0.3*DOWN), run_time=0.8)
         
         # The red mat represents his choice of measurement basis.
         red_measurement_mat = Rectangle(width=1.5, height=2.0, color=RED, fill_opacity=0.3).next_to(moshe, UP)
@@ -142,21 +197,22 @@ class MosheInterceptsScene(Scene):
         
         # The key animation: flipping reveals a now-randomized value.
         self.play(intercepted_card.flip_with_randomization()) # The card face flashes 0/1, settles on '1'.
-        self.wait(0.5)
+        _wait(self, 0.5)
         
         # Second consequence: the card's basis (back) is altered to match the measurement.
         self.play(intercepted_card.alter_basis('X')) # The blue back is repainted to red.
-        self.wait(0.5)
+        _wait(self, 0.5)
         
         # Moshe places the now-corrupted card back.
         self.play(intercepted_card.flip()) # Flip it back face-down.
         
         result_text = Text("Consequence: Card state is now corrupted. Error introduced.", font_size=24)
         result_text.next_to(guess_text, DOWN)
-        self.play(Write(result_text))
-        self.wait(2)
+        self.play(FadeIn(result_text, shift=0.3*DOWN), run_time=0.8)
+        _wait(self, 2)
         
-        self.play(FadeOut(VGroup(intercepted_card, guess_text, result_text, red_measurement_mat)))
+        self.remove(intercepted_card, guess_text, result_text, red_measurement_mat)
+        _wait(self, 0.1)
 
 
 class BobMeasuresAndSiftsScene(Scene):
@@ -168,88 +224,88 @@ class BobMeasuresAndSiftsScene(Scene):
         # We will skip to the result for this script: Bob's measured values and his bases.
         
         # 2. The Sift - Public Basis Comparison
-        alice_bases = ['Z', 'X', 'Z', 'X', 'X', 'Z', 'Z', 'X']
-        bob_bases =   ['Z', 'Z', 'Z', 'X', 'Z', 'Z', 'X', 'X'] # Bob's random choices
-
         alice_row_header = Text("Alice's Public Bases:").to_edge(UP, buff=1.5)
-        alice_row = VGroup(*[
-            Rectangle(width=0.6, height=0.9, color=(BLUE if b == 'Z' else RED)).add(Text(b))
-            for b in alice_bases
-        ]).arrange(RIGHT, buff=0.4).next_to(alice_row_header, DOWN)
+        alice_row = _basis_row(ALICE_BASES, buff=0.4).next_to(alice_row_header, DOWN)
 
         bob_row_header = Text("Bob's Public Bases:").next_to(alice_row, DOWN, buff=1.0)
-        bob_row = VGroup(*[
-            Rectangle(width=0.6, height=0.9, color=(BLUE if b == 'Z' else RED)).add(Text(b))
-            for b in bob_bases
-        ]).arrange(RIGHT, buff=0.4).next_to(bob_row_header, DOWN)
+        bob_row = _basis_row(BOB_BASES, buff=0.4).next_to(bob_row_header, DOWN)
         
         self.play(Write(alice_row_header), FadeIn(alice_row, shift=UP))
         self.play(Write(bob_row_header), FadeIn(bob_row, shift=UP))
-        self.wait(1)
-
-        # Iterate through and compare each basis pair.
-        for i in range(len(alice_bases)):
-            highlighter = SurroundingRectangle(VGroup(alice_row[i], bob_row[i]), buff=0.1)
-            self.play(Create(highlighter))
-            
-            if alice_bases[i] == bob_bases[i]:
-                result = Text("KEEP", color=GREEN)
-                VGroup(alice_row[i], bob_row[i]).set_opacity(1.0)
+        _wait(self, 1)
+
+        # Compare each basis pair, building every step up front and playing them in one batch.
+        # Every column has the same size, so a single highlighter slides from pair to pair.
+        highlighter = SurroundingRectangle(VGroup(alice_row[0], bob_row[0]), buff=0.1)
+        steps = [Create(highlighter)]
+        for i, match in enumerate(SIFT_MASK.tolist()):
+            pair = VGroup(alice_row[i], bob_row[i])
+            if i:
+                steps.append(Transform(highlighter, highlighter.copy().move_to(pair)))
+
+            if match:
+                result = _text("KEEP", color=GREEN).copy()
             else:
-                result = Text("DISCARD", color=GREY)
-                self.play(VGroup(alice_row[i], bob_row[i]).animate.set_opacity(0.3))
+                result = _text("DISCARD", color=GREY).copy()
+                steps.append(pair.animate.set_opacity(0.3))
 
-            result.next_to(highlighter, DOWN)
-            self.play(Write(result))
-            self.play(FadeOut(highlighter))
-        self.wait(2)
+            result.next_to(pair, DOWN, buff=0.1 + MED_SMALL_BUFF)
+            steps.append(Write(result))
+        self.play(Succession(*steps), run_time=12)
+        self.remove(highlighter)
+        _wait(self, 2)
 
 
 class ErrorCheckingScene(Scene):
     def construct(self):
         # Display the final sifted keys for Alice and Bob.
-        # Bases matched at indices: 0, 2, 3, 5, 7
-        alice_sifted_bits = [0, 1, 0, 0, 1]  # Alice's original values at those indices.
+        # Alice keeps her original values wherever the bases matched.
+        alice_sifted_bits = np.array(ALICE_BITS)[SIFT_MASK]
         # Bob's measured value at index 2 was corrupted by Moshe's incorrect 'X' measurement,
         # followed by Bob's incorrect 'Z' measurement, resulting in a random value (e.g., 1).
         bob_sifted_bits =   [0, 1, 1, 0, 1]
 
         alice_header = Text("Alice's Sifted Key:").to_edge(UP, buff=1.5)
-        alice_display = VGroup(*[Integer(b) for b in alice_sifted_bits]).arrange(RIGHT).next_to(alice_header, DOWN)
+        alice_display = VGroup(*[_text(str(b)).copy() for b in alice_sifted_bits]).arrange(RIGHT).next_to(alice_header, DOWN)
         bob_header = Text("Bob's Sifted Key:").next_to(alice_display, DOWN, buff=1.0)
-        bob_display = VGroup(*[Integer(b) for b in bob_sifted_bits]).arrange(RIGHT).next_to(bob_header, DOWN)
+        bob_display = VGroup(*[_text(str(b)).copy() for b in bob_sifted_bits]).arrange(RIGHT).next_to(bob_header, DOWN)
 
         self.play(Write(alice_header), FadeIn(alice_display))
         self.play(Write(bob_header), FadeIn(bob_display))
-        self.wait(1)
+        _wait(self, 1)
 
         # They publicly compare a random subset of these bits.
         test_indices = [1, 2, 4] # e.g., they agree to reveal the 2nd, 3rd, and 5th bits.
         test_label = Text("Publicly Comparing Test Bits...", font_size=32).to_edge(UP)
         self.play(FadeIn(test_label), FadeOut(alice_header), FadeOut(bob_header))
         
-        highlights = VGroup()
-        for i in test_indices:
-            highlights.add(SurroundingRectangle(alice_display[i], color=YELLOW))
-            highlights.add(SurroundingRectangle(bob_display[i], color=YELLOW))
+        highlights = VGroup(*[
+            SurroundingRectangle(display[i], color=YELLOW)
+            for i in test_indices for display in (alice_display, bob_display)
+        ])
         self.play(Create(highlights))
-        self.wait(1)
-
-        # The error at index 2 is revealed.
-        error_index = 2
-        error_highlight = SurroundingRectangle(VGroup(alice_display[error_index], bob_display[error_index]), color=RED, stroke_width=8)
+        _wait(self, 1)
+
+        # Any test bit where the two keys disagree is revealed as an error (here, index 2).
+        mismatches = np.flatnonzero(np.array(alice_sifted_bits) != np.array(bob_sifted_bits))
+        error_indices = np.intersect1d(test_indices, mismatches)
+        assert error_indices.size, "this scene narrates a detected error"
+        error_highlight = VGroup(*[
+            SurroundingRectangle(VGroup(alice_display[i], bob_display[i]), color=RED, stroke_width=8)
+            for i in error_indices
+        ])
         error_text = Text("ERROR DETECTED!", color=RED).next_to(error_highlight, DOWN)
-        self.play(ShowCreation(error_highlight))
-        self.play(Write(error_text))
-        self.wait(1)
+        self.play(Create(error_highlight))
+        self.play(FadeIn(error_text, shift=0.3*DOWN), run_time=0.8)
+        _wait(self, 1)
 
         # Because an error was found, they abort the entire protocol.
         abort_text = Text("Key Compromised! Protocol ABORTED.", font_size=48, color=RED)
         self.play(
             FadeOut(VGroup(alice_display, bob_display, highlights, error_highlight, error_text, test_label)),
-            Write(abort_text)
+            FadeIn(abort_text, shift=0.3*DOWN)
         )
-        self.wait(2)
+        _wait(self, 2)
 
 
 class ConclusionScene(Scene):
@@ -258,21 +314,56 @@ class ConclusionScene(Scene):
         
         # The remaining, non-disclosed bits form the key.
         final_key_bits = [0, 0] # From the previous example, bits at index 0 and 5.
-        final_key_display = VGroup(*[Integer(b) for b in final_key_bits]).arrange(RIGHT, buff=0.5).scale(1.5)
+        final_key_display = VGroup(*[_text(str(b)).copy() for b in final_key_bits]).arrange(RIGHT, buff=0.5).scale(1.5)
         final_key_label = Text("Final Shared Secret Key", font_size=40, color=GREEN)
         final_group = VGroup(final_key_label, final_key_display).arrange(DOWN, buff=0.5)
         self.play(Write(final_group))
-        self.wait(2)
+        _wait(self, 2)
 
         # Explain the core principle.
         principle_text = Text(
             "Security is guaranteed because observation creates detectable errors.",
             font_size=32
         ).to_edge(DOWN)
-        self.play(Write(principle_text))
-        self.wait(2)
+        self.play(FadeIn(principle_text, shift=0.3*DOWN), run_time=0.8)
+        _wait(self, 2)
         
         # Transition back to the main article.
         transition_text = Text("Now, let's connect these rules to the principles of quantum mechanics.", font_size=32)
         self.play(FadeOut(VGroup(final_group, principle_text)), FadeIn(transition_text))
-        self.wait(3)
\ No newline at end of file
+        _wait(self, 3)
+
+
+if __name__ == "__main__":
+    import subprocess
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+
+    # Each scene renders independently, so run one manim process per scene in parallel
+    # and stitch the results together in story (definition) order.
+    scene_names = [
+        name for name, obj in list(globals().items())
+        if isinstance(obj, type) and issubclass(obj, Scene) and obj.__module__ == __name__
+    ]
+    script = Path(__file__).resolve()
+    media_root = script.parent.parent / "media"
+
+    def render(name):
+        # Manim writes its text SVG cache without locking, so each worker gets its own media dir.
+        media_dir = media_root / name
+        subprocess.run(["manim", "-ql", "--media_dir", str(media_dir), str(script), name], check=True)
+        return media_dir / "videos" / script.stem / "480p15" / f"{name}.mp4"
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        videos = list(pool.map(render, scene_names))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as concat_list:
+        concat_list.writelines(f"file '{video}'\n" for video in videos)
+    try:
+        subprocess.run([
+            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list.name,
+            "-c", "copy", str(media_root / "BB84.mp4"),
+        ], check=True)
+    finally:
+        os.remove(concat_list.name)